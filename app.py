@@ -1,27 +1,164 @@
 # 필요한 라이브러리 및 모듈을 임포트합니다.
+import io
 import os
 import re
 import uuid
+import json
+import fcntl
+import signal
+import bisect
+import shutil
+import zipfile
+import contextlib
+import hashlib
 import time
 import logging
 import threading
+import functools
+import multiprocessing
 import requests
-from bs4 import BeautifulSoup
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+from bs4 import BeautifulSoup, SoupStrainer
 from icalendar import Calendar
-from collections import OrderedDict
-from flask import Flask, request, render_template, send_file, jsonify
+from icalendar.cal import Component
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from flask import Flask, Response, request, render_template, send_file, jsonify
 
 # 로깅 설정을 구성하고 로거를 초기화합니다.
-logging.basicConfig(level=logging.DEBUG)
+# 이벤트 단위 로그는 별도 로거로 분리하여, 필요할 때만 EVENT_LOG_LEVEL=DEBUG로 켭니다.
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper())
 logger = logging.getLogger(__name__)
+event_logger = logging.getLogger(f"{__name__}.events")
+event_logger.setLevel(os.environ.get('EVENT_LOG_LEVEL', 'WARNING').upper())
+
+# 성능 지표(카운터와 소요 시간 합계)를 모아 Prometheus 텍스트 형식으로 내보내는 클래스
+class Metrics:
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self._counters = {}
+        self._summaries = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    # 소요 시간 등 관측값의 개수와 합계를 기록합니다
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            summary = self._summaries.setdefault(key, [0, 0.0])
+            summary[0] += 1
+            summary[1] += value
+
+    # counters와 gauges는 스크레이프 시점에 계산한 추가 값입니다 ({(이름, 레이블 tuple): 값})
+    def render(self, counters=None, gauges=None):
+        with self._lock:
+            own_counters = dict(self._counters)
+            summaries = {key: list(value) for key, value in self._summaries.items()}
+        own_counters.update(counters or {})
+
+        lines = []
+        declared = set()
+
+        def sample(metric_type, name, labels, value, suffix=''):
+            full_name = f"{self.prefix}{name}"
+            if full_name not in declared:
+                lines.append(f"# TYPE {full_name} {metric_type}")
+                declared.add(full_name)
+            label_text = ','.join(f'{key}="{value}"' for key, value in labels)
+            lines.append(f"{full_name}{suffix}{{{label_text}}} {value}" if labels else f"{full_name}{suffix} {value}")
+
+        for (name, labels), value in sorted(own_counters.items()):
+            sample('counter', name, labels, value)
+        for (name, labels), (count, total) in sorted(summaries.items()):
+            sample('summary', name, labels, count, '_count')
+            sample('summary', name, labels, total, '_sum')
+        for (name, labels), value in sorted((gauges or {}).items()):
+            sample('gauge', name, labels, value)
+        return '\n'.join(lines) + '\n'
+
+# 아무것도 기록하지 않는 지표 클래스 (프로세스 풀 작업자에서 사용합니다)
+class NullMetrics(Metrics):
+    def inc(self, name, value=1, **labels):
+        pass
+
+    def observe(self, name, value, **labels):
+        pass
+
+METRICS = Metrics('calendar_converter_')
+
+# 업로드 파일과 변환 결과를 저장하는 임시 디렉터리
+TEMP_DIR = '/tmp'
 
 # 최대 작업 수와 작업 큐 및 결과를 저장할 자료 구조를 설정합니다.
-MAX_TASKS = 100
+MAX_TASKS = int(os.environ.get('MAX_TASKS', 100))  # 대기열에 둘 수 있는 최대 작업 수
 task_queue = OrderedDict()
 task_results = OrderedDict()
 task_progress = OrderedDict()
+task_errors = OrderedDict()
+task_timings = OrderedDict()
+task_finished_at = OrderedDict()
 queue_lock = threading.Lock()
 
+# 완료된 작업의 결과와 임시 파일을 보관하는 시간(초)과 정리 주기(초)
+TASK_RESULT_TTL = int(os.environ.get('TASK_RESULT_TTL', 3600))
+REAPER_INTERVAL = 60
+
+# 작업 상태가 바뀔 때마다 대기 중인 이벤트 스트림을 깨우는 클래스
+class TaskUpdates:
+    def __init__(self):
+        self.version = 0
+        self._condition = threading.Condition()
+
+    def notify(self):
+        with self._condition:
+            self.version += 1
+            self._condition.notify_all()
+
+    # version 이후로 변경이 생기거나 timeout이 지날 때까지 기다린 뒤 현재 version을 반환합니다
+    def wait(self, version, timeout):
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+task_updates = TaskUpdates()
+
+# 작업 스케줄러 설정 (환경 변수로 조정할 수 있습니다)
+WORKER_COUNT = int(os.environ.get('WORKER_COUNT', 4))
+TASK_TIMEOUT = int(os.environ.get('TASK_TIMEOUT', 600))  # 작업당 최대 처리 시간(초)
+USE_PROCESS_POOL = os.environ.get('USE_PROCESS_POOL', '').lower() in ('1', 'true', 'yes')
+RETRY_AFTER = 10  # 대기열이 가득 찼을 때 클라이언트에게 알려줄 재시도 간격(초)
+PROCESS_POLL_INTERVAL = 0.5  # 프로세스 풀 작업의 진행 상황을 확인하는 간격(초)
+PROCESS_KILL_GRACE = 5  # 취소나 시간 초과 후 작업자 프로세스가 스스로 멈추기를 기다리는 시간(초)
+
+# Server-Sent Events 설정: 연결 유지 주석을 보내는 간격과 한 연결의 최대 유지 시간(초)
+# (연결이 끊기면 브라우저가 자동으로 다시 연결합니다)
+SSE_KEEPALIVE_INTERVAL = 15
+SSE_MAX_DURATION = int(os.environ.get('SSE_MAX_DURATION', 300))
+# 동시에 열어 둘 수 있는 이벤트 스트림 수 (스트림마다 요청 스레드를 하나씩 차지하므로, 나머지 스레드는 업로드와 다운로드에 남겨 둡니다)
+SSE_MAX_STREAMS = int(os.environ.get('SSE_MAX_STREAMS', 16))
+sse_slots = threading.BoundedSemaphore(SSE_MAX_STREAMS)
+
+# 진행 상황 보고 주기: 이벤트 N개마다 또는 T 밀리초마다 (둘 중 먼저 도달하는 쪽)
+PROGRESS_EVERY_EVENTS = int(os.environ.get('PROGRESS_EVERY_EVENTS', 100))
+PROGRESS_INTERVAL_MS = int(os.environ.get('PROGRESS_INTERVAL_MS', 250))
+
+# /convert 및 /convert/batch 에서 요청 안에서 바로 변환할 수 있는 파일 크기와 개수의 상한
+SYNC_CONVERT_MAX_BYTES = int(os.environ.get('SYNC_CONVERT_MAX_BYTES', 1024 * 1024))
+BATCH_MAX_FILES = int(os.environ.get('BATCH_MAX_FILES', 200))
+BATCH_MAX_BYTES = int(os.environ.get('BATCH_MAX_BYTES', 16 * 1024 * 1024))  # 일괄 변환 요청 하나의 전체 크기 상한
+# 일괄 변환은 업로드 작업과 별도의 작업자에서 실행하고, 동시에 처리하는 일괄 요청 수를 제한합니다
+BATCH_WORKER_COUNT = int(os.environ.get('BATCH_WORKER_COUNT', 2))
+MAX_BATCHES = int(os.environ.get('MAX_BATCHES', 2))
+
+# 0으로 설정하면 달력 전체를 메모리에 올리는 기존 방식으로 변환합니다
+STREAMING_CONVERSION = os.environ.get('STREAMING_CONVERSION', '1').lower() not in ('0', 'false', 'no')
+
 # 교실 데이터를 저장할 리스트 초기화
 CLASSROOM_DATA = []  # 메모리에 교실 데이터를 저장
 
@@ -29,101 +166,917 @@ CLASSROOM_DATA = []  # 메모리에 교실 데이터를 저장
 MAX_RETRIES = 5
 RETRY_DELAY = 5
 
+# 교실 데이터를 가져올 주소와 디스크 스냅샷 설정
+CLASSROOM_FINDER_URL = os.environ.get('CLASSROOM_FINDER_URL', "https://semmelweis.hu/registrar/information/classroom-finder/")
+CLASSROOM_SNAPSHOT_PATH = os.environ.get('CLASSROOM_SNAPSHOT_PATH', os.path.join(TEMP_DIR, 'classroom_snapshot.json'))
+UPDATE_INTERVAL = 3600  # 교실 데이터 갱신 주기(초)
+SNAPSHOT_CHECK_INTERVAL = 60  # 다른 작업자가 갱신한 스냅샷을 확인하는 주기(초)
+
+# 마지막으로 가져온 교실 데이터의 조건부 요청 헤더 값과 가져온 시각
+classroom_source = {'etag': None, 'last_modified': None, 'fetched_at': 0}
+
+# 변환 결과 캐시 설정 (같은 파일을 다시 올리면 저장된 결과를 바로 돌려줍니다)
+RESULT_CACHE_DIR = os.environ.get('RESULT_CACHE_DIR', os.path.join(TEMP_DIR, 'calendar_result_cache'))
+RESULT_CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 100 * 1024 * 1024))
+
+# 부분 검색 시 허용되는 최소 검색 길이
+MIN_SEARCH_LENGTH = 5
+
+# 교실 코드 검색을 위한 인덱스 클래스
+class ClassroomIndex:
+    def __init__(self, data):
+        self.data = list(data)
+        # 데이터 내용이 같으면 같은 값이 나오므로, 데이터 변경 감지와 결과 캐시 키에 사용합니다
+        self.fingerprint = hashlib.sha256(repr(self.data).encode()).hexdigest()
+        self.max_code_length = max((len(classroom[0]) for classroom in self.data), default=0)
+
+        # 모든 교실 코드의 접미사를 정렬해 두면, 검색어를 접두사로 가지는 접미사들이 연속 구간을 이룹니다
+        suffixes = sorted(
+            (classroom[0][start:], position)
+            for position, classroom in enumerate(self.data)
+            for start in range(len(classroom[0]))
+        )
+        self._suffixes = [suffix for suffix, _ in suffixes]
+
+        # 구간 내 가장 앞선 교실 위치를 빠르게 찾기 위한 희소 테이블(sparse table)
+        self._min_positions = [[position for _, position in suffixes]]
+        width = 1
+        while width * 2 <= len(suffixes):
+            previous = self._min_positions[-1]
+            self._min_positions.append([
+                min(previous[i], previous[i + width])
+                for i in range(len(previous) - width)
+            ])
+            width *= 2
+
+        # 교실 코드로 바로 찾을 수 있도록 해시 맵을 만듭니다 (기존 선형 검색과 같은 결과를 저장)
+        self._exact = {}
+        for classroom in self.data:
+            if classroom[0] not in self._exact:
+                self._exact[classroom[0]] = self._find_first(classroom[0])
+
+    # 교실 코드에 검색어가 포함된 첫 번째 교실을 찾는 함수
+    def _find_first(self, classroom_name):
+        if not classroom_name:
+            return self.data[0] if self.data else None
+        if len(classroom_name) > self.max_code_length:
+            return None
+
+        start = bisect.bisect_left(self._suffixes, classroom_name)
+        end = bisect.bisect_left(self._suffixes, classroom_name + '\U0010ffff', start)
+        if start >= end:
+            return None
+
+        level = (end - start).bit_length() - 1
+        row = self._min_positions[level]
+        return self.data[min(row[start], row[end - (1 << level)])]
+
+    # 기존 fetch_classroom_info와 같은 규칙(첫 번째 매칭 우선, 한 글자씩 줄이는 부분 검색)으로 교실을 찾는 함수
+    def lookup(self, classroom_name, partial_search=False):
+        if classroom_name in self._exact:
+            return self._exact[classroom_name]
+
+        match = self._find_first(classroom_name)
+        if match is None and partial_search and len(classroom_name) > MIN_SEARCH_LENGTH:
+            # 교실 코드보다 긴 접두사는 매칭될 수 없으므로 건너뜁니다
+            longest = min(len(classroom_name) - 1, self.max_code_length)
+            for length in range(longest, MIN_SEARCH_LENGTH - 1, -1):
+                match = self._find_first(classroom_name[:length])
+                if match is not None:
+                    break
+
+        return match if match is not None else (None, None, None, None)
+
+# 교실 데이터 검색 인덱스 (데이터 갱신 시 통째로 교체됩니다)
+CLASSROOM_INDEX = ClassroomIndex(CLASSROOM_DATA)
+
 # 교실 정보를 가져오는 함수
 def fetch_classroom_info(classroom_name, partial_search=False):
-    logger.debug(f"Searching for classroom: {classroom_name} with partial_search={partial_search}")
-    
-    # 최소 검색 길이를 5글자로 설정합니다
-    MIN_SEARCH_LENGTH = 5
-    
-    for classroom in CLASSROOM_DATA:
-        if classroom_name in classroom[0]:
-            logger.debug(f"Found match: {classroom}")
-            return classroom
-    
-    # 부분 검색을 허용하고, 현재 검색 길이가 최소 검색 길이보다 길 때만 재귀 호출
-    if partial_search and len(classroom_name) > MIN_SEARCH_LENGTH:
-        return fetch_classroom_info(classroom_name[:-1], partial_search=True)
-    
-    logger.debug(f"No match found for classroom: {classroom_name}")
-    return None, None, None, None
-
-# 달력을 처리하는 함수
-def process_calendar(temp_file_path, task_id):
+    classroom = CLASSROOM_INDEX.lookup(classroom_name, partial_search=partial_search)
+    METRICS.inc('classroom_lookups_total', result='hit' if classroom[0] is not None else 'miss', partial=str(partial_search).lower())
+    if event_logger.isEnabledFor(logging.DEBUG):
+        if classroom[0] is not None:
+            event_logger.debug("Found match for %s (partial_search=%s): %s", classroom_name, partial_search, classroom)
+        else:
+            event_logger.debug("No match found for classroom: %s (partial_search=%s)", classroom_name, partial_search)
+    return classroom
+
+# 변환 작업들이 함께 사용하는 장소 문자열 캐시의 최대 항목 수
+LOCATION_CACHE_SIZE = 1024
+
+# 장소 문자열별 검색 결과를 저장하는 LRU 캐시 클래스
+class LocationCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, location):
+        with self._lock:
+            if location in self._entries:
+                self._entries.move_to_end(location)
+                self.hits += 1
+                return self._entries[location]
+            self.misses += 1
+            return None
+
+    # 검색을 시작할 때의 세대(generation)가 그대로일 때만 저장하여, 갱신 전 데이터로 만든 결과가 남지 않도록 합니다
+    def put(self, location, value, generation):
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[location] = value
+            self._entries.move_to_end(location)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    # 교실 데이터가 교체될 때 호출하여 기존 항목을 무효화합니다
+    # affected(location, resolved)를 주면 그 함수가 True를 반환하는 항목만 지웁니다
+    def invalidate(self, affected=None):
+        with self._lock:
+            self.generation += 1
+            if affected is None:
+                self._entries.clear()
+                return
+            for location in [location for location, resolved in self._entries.items() if affected(location, resolved)]:
+                del self._entries[location]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'generation': self.generation,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+LOCATION_CACHE = LocationCache(LOCATION_CACHE_SIZE)
+
+# 장소 문자열을 (교실 코드, 교실 설명, 학과, 주소, 표시 문자열)로 변환하는 함수
+def resolve_location(location):
+    cached = LOCATION_CACHE.get(location)
+    if cached is not None:
+        return cached
+
+    generation = LOCATION_CACHE.generation
+    classroom_code, classroom_details, pure_department, address_cleaned = fetch_classroom_info(location)
+    if not address_cleaned:
+        # 정확한 매칭이 없을 때, 부분 검색 시도
+        classroom_code, classroom_details, pure_department, address_cleaned = fetch_classroom_info(location, partial_search=True)
+        if address_cleaned:
+            location_display = f"*({location}){classroom_code}"
+        else:
+            location_display = location
+    else:
+        location_display = classroom_code
+
+    resolved = (classroom_code, classroom_details, pure_department, address_cleaned, location_display)
+    LOCATION_CACHE.put(location, resolved, generation)
+    return resolved
+
+# 파일을 하드 링크로 연결하고, 불가능하면 복사하는 함수
+def _link_or_copy(source_path, destination_path):
     try:
-        logger.debug(f"Starting to process calendar for task {task_id}")
-        with open(temp_file_path, 'rb') as f:
-            cal = Calendar.from_ical(f.read())
-
-        new_cal = Calendar()
-
-        # VEVENT 컴포넌트를 추출
-        events = [component for component in cal.walk() if component.name == "VEVENT"]
-        total_events = len(events)
-        processed_events = 0
-
-        logger.debug(f"Total events to process: {total_events}")
-
-        # 각 이벤트를 처리
-        for component in events:
-            location = component.get('LOCATION')
-            if location:
-                logger.debug(f"Processing event with location: {location}")
-                classroom_code, classroom_details, pure_department, address_cleaned = fetch_classroom_info(location)
-                if not address_cleaned:
-                    # 정확한 매칭이 없을 때, 부분 검색 시도
-                    classroom_code, classroom_details, pure_department, address_cleaned = fetch_classroom_info(location, partial_search=True)
-                    if address_cleaned:
-                        location_display = f"*({location}){classroom_code}"
-                    else:
-                        location_display = location
-                else:
-                    location_display = classroom_code
-
-                if address_cleaned:
-                    new_description = f"{location_display} - {classroom_details}\nDepartment: {pure_department}"
-                    component['LOCATION'] = address_cleaned
-                    component['DESCRIPTION'] = new_description
-                    logger.debug(f"Updated location: {address_cleaned}")
-                    logger.debug(f"Updated description: {new_description}")
-                else:
-                    logger.debug(f"No matching classroom info found for location: {location}")
-            new_cal.add_component(component)
-            
-            processed_events += 1
-            progress = int((processed_events / total_events) * 100)
-            task_progress[task_id] = progress
-            logger.debug(f"Task {task_id}: Processed {processed_events}/{total_events} events. Progress: {progress}%")
-
-            if processed_events % 10 == 0:
-                time.sleep(0.1)
-
-        output_file_path = os.path.join('/tmp', f'{task_id}_output.ics')
-        with open(output_file_path, 'wb') as f:
-            f.write(new_cal.to_ical())
+        os.link(source_path, destination_path)
+    except OSError:
+        shutil.copyfile(source_path, destination_path)
+
+# 업로드 파일 내용과 교실 데이터 버전을 키로 변환 결과를 디스크에 저장하는 LRU 캐시 클래스
+class ResultCache:
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()  # 키 -> 파일 크기
+        self._total_bytes = 0
+        self._lock = threading.Lock()
 
+        # 이전 실행에서 남은 결과도 사용할 수 있도록 수정 시각 순서대로 불러옵니다
+        os.makedirs(directory, exist_ok=True)
+        with self._directory_lock():
+            self._scan()
+            self._evict()
+
+    # 여러 작업자가 같은 디렉터리를 함께 쓰므로, 크기 계산과 삭제는 파일 잠금 안에서 디렉터리 전체를 기준으로 합니다
+    @contextlib.contextmanager
+    def _directory_lock(self):
+        with open(os.path.join(self.directory, '.lock'), 'a') as lock_file:
+            fcntl.lockf(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.lockf(lock_file, fcntl.LOCK_UN)
+
+    # 디렉터리에 있는 결과 파일을 수정 시각 순서대로 다시 읽는 함수
+    # (다른 작업자가 읽는 도중에 지운 파일은 건너뜁니다)
+    def _scan(self):
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.ics'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, entry.name[:-len('.ics')], stat.st_size))
+        files.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in files)
+        self._total_bytes = sum(self._entries.values())
+
+    @staticmethod
+    def _key(content_hash, fingerprint):
+        return f"{fingerprint[:16]}_{content_hash}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.ics')
+
+    def _remove(self, key):
+        self._total_bytes -= self._entries.pop(key)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    # 캐시된 결과가 있으면 destination_path에 연결하고 True를 반환하는 함수
+    # (다른 작업자가 저장한 결과도 사용할 수 있도록 디렉터리에서 직접 찾습니다)
+    def get(self, content_hash, fingerprint, destination_path):
+        key = self._key(content_hash, fingerprint)
+        with self._lock:
+            try:
+                _link_or_copy(self._path(key), destination_path)
+                # 하드 링크는 캐시 파일의 예전 수정 시각을 그대로 가지므로 갱신합니다
+                # (만료된 임시 파일 정리에서 지워지지 않고, 모든 작업자의 LRU 순서에도 반영됩니다)
+                os.utime(destination_path)
+            except OSError:
+                # 다른 프로세스가 파일을 지운 경우 등은 캐시 미스로 처리합니다
+                if key in self._entries:
+                    self._total_bytes -= self._entries.pop(key)
+                self.misses += 1
+                return False
+            if key not in self._entries:
+                self._entries[key] = os.path.getsize(destination_path)
+                self._total_bytes += self._entries[key]
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True
+
+    def put(self, content_hash, fingerprint, source_path):
+        size = os.path.getsize(source_path)
+        if size > self.max_bytes:
+            return
+        key = self._key(content_hash, fingerprint)
+        with self._lock, self._directory_lock():
+            temp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+            _link_or_copy(source_path, temp_path)
+            os.replace(temp_path, self._path(key))
+            # 다른 작업자가 저장한 결과까지 합쳐 상한을 지킵니다
+            self._scan()
+            self._evict()
+
+    # 교실 데이터가 바뀌면 다른 버전의 데이터로 만든 결과를 모두 지웁니다
+    def invalidate(self, fingerprint):
+        prefix = f"{fingerprint[:16]}_"
+        with self._lock, self._directory_lock():
+            # 다른 작업자가 이전 데이터로 저장한 결과도 함께 지웁니다
+            self._scan()
+            for key in [key for key in self._entries if not key.startswith(prefix)]:
+                self._remove(key)
+                self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+RESULT_CACHE = ResultCache(RESULT_CACHE_DIR, RESULT_CACHE_MAX_BYTES)
+
+# 업로드된 파일을 저장하면서 SHA-256 해시를 계산하는 함수
+def save_upload(file, path):
+    digest = hashlib.sha256()
+    with open(path, 'wb') as f:
+        for chunk in iter(lambda: file.stream.read(64 * 1024), b''):
+            digest.update(chunk)
+            f.write(chunk)
+    return digest.hexdigest()
+
+# 작업 결과 파일의 경로를 반환하는 함수
+def task_output_path(task_id):
+    return os.path.join(TEMP_DIR, f'{task_id}_output.ics')
+
+# 작업이 취소되거나 제한 시간을 넘겼을 때 발생하는 예외
+class TaskCancelled(Exception):
+    pass
+
+# 진행 상황을 이벤트 N개 또는 T 밀리초마다 한 번씩만 보고하도록 조절하는 클래스
+class ProgressThrottle:
+    def __init__(self, report_progress, total_events):
+        self.report_progress = report_progress
+        self.total_events = total_events
+        self.interval = PROGRESS_INTERVAL_MS / 1000
+        self.next_report_time = time.monotonic() + self.interval
+
+    def update(self, processed_events):
+        if self.report_progress and (
+            processed_events % PROGRESS_EVERY_EVENTS == 0
+            or processed_events == self.total_events
+            or time.monotonic() >= self.next_report_time
+        ):
+            self.report_progress(processed_events, self.total_events)
+            self.next_report_time = time.monotonic() + self.interval
+
+# 이벤트의 LOCATION과 DESCRIPTION을 교실 정보로 바꾸는 함수
+def rewrite_event(component, log_events=False):
+    location = component.get('LOCATION')
+    if not location:
+        return
+
+    classroom_code, classroom_details, pure_department, address_cleaned, location_display = resolve_location(location)
+    if address_cleaned:
+        new_description = f"{location_display} - {classroom_details}\nDepartment: {pure_department}"
+        component['LOCATION'] = address_cleaned
+        component['DESCRIPTION'] = new_description
+        if log_events:
+            event_logger.debug("Updated location %s -> %s (%s)", location, address_cleaned, new_description)
+    elif log_events:
+        event_logger.debug("No matching classroom info found for location: %s", location)
+
+# 달력 파일에서 접힌 줄을 펼친 content line과 그 원본 바이트를 차례로 읽어 오는 함수
+def _iter_content_lines(input_file):
+    logical = None
+    raw = []
+    for line in input_file:
+        stripped = line[:-1] if line.endswith(b'\n') else line
+        if stripped.endswith(b'\r'):
+            stripped = stripped[:-1]
+
+        # 빈 줄은 무시하고, 공백이나 탭으로 시작하는 줄은 앞 줄에 이어 붙입니다 (icalendar의 unfold 규칙과 동일)
+        if not stripped:
+            if logical is not None:
+                raw.append(line)
+            continue
+        if logical is not None and stripped[:1] in (b' ', b'\t'):
+            logical.append(stripped[1:])
+            raw.append(line)
+            continue
+
+        if logical is not None:
+            yield b''.join(logical), b''.join(raw)
+        logical = [stripped]
+        raw = [line]
+
+    if logical is not None:
+        yield b''.join(logical), b''.join(raw)
+
+# 지정한 이름의 컴포넌트를 (이름, 원본 바이트) 단위로 하나씩 잘라 내는 함수
+def _iter_component_chunks(input_file, names):
+    buffer = None
+    depth = 0
+    component_name = None
+    for line_number, (logical, raw) in enumerate(_iter_content_lines(input_file)):
+        key, _, value = logical.partition(b':')
+        key = key.split(b';', 1)[0].upper()
+        # 앞뒤 공백이 붙은 "BEGIN:VCALENDAR "도 전체 파싱 때처럼 받아들입니다
+        if line_number == 0 and (key != b'BEGIN' or value.strip().upper() != b'VCALENDAR'):
+            raise ValueError("Not an iCalendar file: expected BEGIN:VCALENDAR")
+        if buffer is None:
+            # 구성 요소 이름은 공백을 지우지 않습니다: 전체 파싱도 "VEVENT "를 다른 구성 요소로 보고 변환하지 않기 때문입니다
+            if key == b'BEGIN' and value.upper() in names:
+                component_name = value.upper()
+                buffer = [raw]
+                depth = 1
+            continue
+
+        buffer.append(raw)
+        if key == b'BEGIN':
+            depth += 1
+        elif key == b'END':
+            depth -= 1
+            if depth == 0:
+                yield component_name, b''.join(buffer)
+                buffer = None
+
+    if buffer is not None:
+        raise ValueError(f"Unterminated {component_name.decode()} component")
+
+# 달력을 이벤트 하나씩 읽고 변환하여, 출력할 바이트 조각을 차례로 내보내는 함수
+# timings dict를 주면 단계별 소요 시간(parse, lookup, serialize)과 이벤트 수를 기록합니다
+def iter_converted_calendar(input_file, report_progress=None, timings=None):
+    total_events = None
+    if report_progress:
+        # 진행률 계산을 위해 이벤트 수만 먼저 세고 처음으로 되돌아갑니다
+        total_events = sum(1 for _ in _iter_component_chunks(input_file, (b'VEVENT',)))
+        input_file.seek(0)
+        logger.debug("Total events to process: %d", total_events)
+
+    log_events = event_logger.isEnabledFor(logging.DEBUG)
+    progress = ProgressThrottle(report_progress, total_events)
+    processed_events = 0
+    parse_time = lookup_time = serialize_time = 0.0
+
+    yield b'BEGIN:VCALENDAR\r\n'
+    started = time.perf_counter()
+    for name, chunk in _iter_component_chunks(input_file, (b'VEVENT', b'VTIMEZONE')):
+        component = Component.from_ical(chunk)
+        parsed = time.perf_counter()
+        parse_time += parsed - started
+        # VTIMEZONE은 출력하지 않지만, 파싱해 두어야 사용자 정의 TZID를 전체 파싱 때와 같이 해석합니다
+        if name == b'VTIMEZONE':
+            started = parsed
+            continue
+
+        rewrite_event(component, log_events)
+        looked_up = time.perf_counter()
+        lookup_time += looked_up - parsed
+        output = component.to_ical()
+        serialize_time += time.perf_counter() - looked_up
+        yield output
+
+        processed_events += 1
+        progress.update(processed_events)
+        started = time.perf_counter()
+    yield b'END:VCALENDAR\r\n'
+
+    if timings is not None:
+        timings.update(parse=parse_time, lookup=lookup_time, serialize=serialize_time, events=processed_events)
+
+# 달력 전체를 메모리에 올려 변환하는 기존 방식의 함수
+def _convert_calendar_in_memory(input_path, output_path, report_progress=None):
+    started = time.perf_counter()
+    with open(input_path, 'rb') as f:
+        cal = Calendar.from_ical(f.read())
+
+    new_cal = Calendar()
+
+    # VEVENT 컴포넌트를 추출
+    events = [component for component in cal.walk() if component.name == "VEVENT"]
+    total_events = len(events)
+    logger.debug("Total events to process: %d", total_events)
+
+    log_events = event_logger.isEnabledFor(logging.DEBUG)
+    progress = ProgressThrottle(report_progress, total_events)
+    parsed = time.perf_counter()
+
+    # 각 이벤트를 처리
+    for processed_events, component in enumerate(events, 1):
+        rewrite_event(component, log_events)
+        new_cal.add_component(component)
+        progress.update(processed_events)
+    looked_up = time.perf_counter()
+
+    with open(output_path, 'wb') as f:
+        f.write(new_cal.to_ical())
+
+    return {
+        'parse': parsed - started,
+        'lookup': looked_up - parsed,
+        'serialize': time.perf_counter() - looked_up,
+        'events': total_events,
+    }
+
+# 달력 파일을 변환하여 출력 파일로 저장하는 함수 (진행 상황은 report_progress 콜백으로 알립니다)
+# 단계별 소요 시간과 이벤트 수를 dict로 반환합니다
+def convert_calendar(input_path, output_path, report_progress=None):
+    if not STREAMING_CONVERSION:
+        return _convert_calendar_in_memory(input_path, output_path, report_progress)
+
+    timings = {}
+    try:
+        with open(input_path, 'rb') as input_file, open(output_path, 'wb') as output_file:
+            for chunk in iter_converted_calendar(input_file, report_progress, timings):
+                output_file.write(chunk)
+    except Exception:
+        # 중간에 실패하면 일부만 쓰인 출력 파일을 남기지 않습니다
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+    return timings
+
+# 메모리에 있는 달력 내용을 변환하여 바이트로 반환하는 함수 (임시 파일을 쓰지 않습니다)
+def convert_calendar_bytes(content, timings=None):
+    return b''.join(iter_converted_calendar(io.BytesIO(content), timings=timings))
+
+# 달력 내용을 변환하고, 변환된 바이트와 단계별 소요 시간(전체 변환 시간은 convert)을 함께 반환하는 함수
+def _convert_bytes_with_timings(content):
+    timings = {}
+    started = time.perf_counter()
+    output = convert_calendar_bytes(content, timings)
+    timings['convert'] = time.perf_counter() - started
+    return output, timings
+
+# 변환 한 건의 소요 시간과 단계별 시간을 지표에 기록하는 함수
+def record_conversion(mode, duration, timings):
+    METRICS.inc('conversions_total', mode=mode, result='success')
+    METRICS.observe('conversion_seconds', duration, mode=mode)
+    METRICS.inc('events_converted_total', timings.get('events', 0), mode=mode)
+    for stage in ('parse', 'lookup', 'serialize'):
+        if stage in timings:
+            METRICS.observe('stage_seconds', timings[stage], stage=stage)
+
+# 작업 결과를 기록하고 대기 중인 이벤트 스트림에 알리는 함수 (실패한 작업은 output_file_path가 None)
+def finish_task(task_id, output_file_path, error=None):
+    with queue_lock:
+        task_queue.pop(task_id, None)
+        if error:
+            task_errors[task_id] = error
         task_results[task_id] = output_file_path
+        task_finished_at[task_id] = time.time()
+    task_updates.notify()
+
+# 작업 진행률(%)을 기록하는 함수
+def update_task_progress(task_id, processed_events, total_events):
+    progress = int((processed_events / total_events) * 100)
+    if task_progress.get(task_id) != progress:
+        task_progress[task_id] = progress
+        task_updates.notify()
+    logger.debug("Task %s: Processed %d/%d events. Progress: %d%%", task_id, processed_events, total_events, progress)
+
+# 달력을 처리하는 함수 (convert 인자로 변환 방식을 바꿀 수 있습니다)
+def process_calendar(temp_file_path, task_id, convert=convert_calendar, content_hash=None):
+    try:
+        logger.debug(f"Starting to process calendar for task {task_id}")
+        fingerprint = CLASSROOM_INDEX.fingerprint
+        output_file_path = task_output_path(task_id)
+        started = time.perf_counter()
+        timings = convert(temp_file_path, output_file_path, lambda processed, total: update_task_progress(task_id, processed, total)) or {}
+        duration = time.perf_counter() - started
+        record_conversion('task', duration, timings)
+        task_timings.setdefault(task_id, {}).update(timings, convert=duration)
+
+        # 변환 중에 교실 데이터가 바뀌지 않았을 때만 결과를 캐시에 저장합니다
+        if content_hash and CLASSROOM_INDEX.fingerprint == fingerprint:
+            RESULT_CACHE.put(content_hash, fingerprint, output_file_path)
+
+        finish_task(task_id, output_file_path)
         logger.debug(f"Task {task_id} completed successfully")
+    except TaskCancelled as e:
+        logger.warning(f"Task {task_id} stopped: {e}")
+        METRICS.inc('conversions_total', mode='task', result='cancelled')
+        finish_task(task_id, None, str(e))
     except Exception as e:
         logger.error(f"Error processing calendar for task {task_id}: {e}", exc_info=True)
-        task_results[task_id] = None
+        METRICS.inc('conversions_total', mode='task', result='failure')
+        finish_task(task_id, None)
     finally:
-        with queue_lock:
-            if task_id in task_queue:
-                del task_queue[task_id]
+        # 변환이 끝난 업로드 파일은 더 이상 필요하지 않습니다
+        try:
+            os.remove(temp_file_path)
+        except OSError:
+            pass
+
+# 프로세스 풀 작업자가 마지막으로 받은 교실 데이터 세대
+_worker_generation = None
+
+# 프로세스 풀 작업자의 교실 데이터를 부모 프로세스와 같은 세대로 맞추는 함수
+def _sync_worker_data(generation, data):
+    global CLASSROOM_DATA, CLASSROOM_INDEX, LOCATION_CACHE, METRICS, _worker_generation
+    if generation != _worker_generation:
+        # fork 시점에 다른 스레드가 잡고 있던 잠금을 물려받지 않도록 캐시를 새로 만듭니다
+        CLASSROOM_INDEX = ClassroomIndex(data)
+        CLASSROOM_DATA = CLASSROOM_INDEX.data
+        LOCATION_CACHE = LocationCache(LOCATION_CACHE_SIZE)
+        # 작업자에서 기록한 지표는 부모 프로세스에 전달되지 않으므로, 잠금을 쓰지 않는 빈 지표로 바꿉니다
+        METRICS = NullMetrics(METRICS.prefix)
+        _worker_generation = generation
+
+# 프로세스 풀에서 실행되는 변환 함수
+def _convert_in_worker(input_path, output_path, task_id, generation, data, shared_progress, cancel_requests, worker_pids):
+    # 응답하지 않을 때 부모 프로세스가 종료할 수 있도록 pid를 알립니다
+    worker_pids[task_id] = os.getpid()
+    _sync_worker_data(generation, data)
+
+    last_progress = -1
+
+    # 진행률이 바뀔 때만 부모 프로세스와 통신합니다
+    def report_progress(processed_events, total_events):
+        nonlocal last_progress
+        progress = int((processed_events / total_events) * 100)
+        if progress == last_progress:
+            return
+        last_progress = progress
+        reason = cancel_requests.get(task_id)
+        if reason:
+            raise TaskCancelled(reason)
+        shared_progress[task_id] = (processed_events, total_events)
+
+    return convert_calendar(input_path, output_path, report_progress)
+
+# 스케줄러가 관리하는 개별 작업 클래스
+class Job:
+    def __init__(self, task_id, input_path, content_hash=None):
+        self.task_id = task_id
+        self.input_path = input_path
+        self.content_hash = content_hash
+        self.started = False
+        self.submitted_at = time.monotonic()
+        self.deadline = None
+        self.future = None
+        self.cancel_event = threading.Event()
+
+# 제한된 수의 작업자로 달력 변환 작업을 실행하는 스케줄러 클래스
+class TaskScheduler:
+    def __init__(self, worker_count, max_pending, timeout, use_processes=False, batch_worker_count=2, max_batches=2):
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix='calendar-worker')
+
+        # 일괄 변환 전용 작업자 (업로드 작업의 대기열 앞에 끼어들지 않도록 분리합니다)
+        self._batch_executor = ThreadPoolExecutor(max_workers=batch_worker_count, thread_name_prefix='batch-worker')
+        self._batch_slots = threading.BoundedSemaphore(max_batches)
+
+        # 프로세스 풀을 사용할 때는 스레드가 작업 순서와 취소를 관리하고, 실제 변환은 하위 프로세스에서 실행합니다
+        self._process_pool = None
+        if use_processes:
+            context = multiprocessing.get_context('fork')
+            self._manager = context.Manager()
+            self._shared_progress = self._manager.dict()
+            self._cancel_requests = self._manager.dict()
+            self._worker_pids = self._manager.dict()
+            self._process_pool_lock = threading.Lock()
+            self._process_worker_count = worker_count
+            self._process_pool = ProcessPoolExecutor(max_workers=worker_count, mp_context=context)
+
+    def _pending_count(self):
+        return sum(1 for job in self._jobs.values() if not job.started)
+
+    # 대기 중인 작업과 실행 중인 작업의 수를 반환하는 함수
+    def counts(self):
+        with self._lock:
+            pending = self._pending_count()
+            return pending, len(self._jobs) - pending
+
+    # 작업을 대기열에 추가하는 함수 (대기열이 가득 차면 False를 반환합니다)
+    def submit(self, task_id, input_path, content_hash=None):
+        with self._lock:
+            if self._pending_count() >= self.max_pending:
+                return False
+            job = Job(task_id, input_path, content_hash)
+            self._jobs[task_id] = job
+            job.future = self._executor.submit(self._run, job)
+        return True
+
+    # 대기 중인 작업의 순번을 반환하는 함수 (실행 중이면 0, 알 수 없는 작업이면 None)
+    def queue_position(self, task_id):
+        with self._lock:
+            job = self._jobs.get(task_id)
+            if job is None:
+                return None
+            if job.started:
+                return 0
+            position = 1
+            for other in self._jobs.values():
+                if other is job:
+                    return position
+                if not other.started:
+                    position += 1
+
+    # 작업을 취소하는 함수 (실행 중인 작업은 다음 진행 상황 보고 시점에 멈춥니다)
+    def cancel(self, task_id):
+        with self._lock:
+            job = self._jobs.get(task_id)
+            if job is None:
+                return False
+            job.cancel_event.set()
+            cancelled_before_start = job.future.cancel()
+            if cancelled_before_start:
+                del self._jobs[task_id]
+
+        if cancelled_before_start:
+            logger.info(f"Task {task_id} cancelled before it started")
+            METRICS.inc('conversions_total', mode='task', result='cancelled')
+            finish_task(task_id, None, 'Task was cancelled')
+            try:
+                os.remove(job.input_path)
+            except OSError:
+                pass
+        return True
+
+    # 여러 달력 내용을 일괄 변환 전용 작업자로 변환하는 함수
+    # 각 결과는 (변환된 바이트, 단계별 소요 시간) 또는 발생한 예외입니다
+    # 동시에 처리 중인 일괄 요청 수가 한도에 이르면 None을 반환합니다
+    def convert_many(self, contents):
+        if not self._batch_slots.acquire(blocking=False):
+            return None
+        try:
+            futures = [self._batch_executor.submit(_convert_bytes_with_timings, content) for content in contents]
+            results = []
+            deadline = time.monotonic() + self.timeout
+            for future in futures:
+                try:
+                    results.append(future.result(timeout=max(deadline - time.monotonic(), 0)))
+                except FuturesTimeoutError:
+                    future.cancel()
+                    results.append(TaskCancelled(f'Conversion exceeded the {self.timeout} second time limit'))
+                except Exception as e:
+                    results.append(e)
+            return results
+        finally:
+            self._batch_slots.release()
+
+    def _run(self, job):
+        with self._lock:
+            job.started = True
+            job.deadline = time.monotonic() + self.timeout
+        queue_wait = job.deadline - self.timeout - job.submitted_at
+        METRICS.observe('queue_wait_seconds', queue_wait)
+        task_timings.setdefault(job.task_id, {})['queue_wait'] = queue_wait
+        # 대기열 순번이 바뀌었음을 알립니다
+        task_updates.notify()
+        try:
+            convert = self._convert_in_process if self._process_pool else self._convert_in_thread
+            process_calendar(
+                job.input_path, job.task_id,
+                convert=functools.partial(convert, job), content_hash=job.content_hash,
+            )
+        finally:
+            with self._lock:
+                self._jobs.pop(job.task_id, None)
+
+    # 작업이 취소되었거나 제한 시간을 넘겼다면 그 이유를 반환하는 함수
+    def _stop_reason(self, job):
+        if job.cancel_event.is_set():
+            return 'Task was cancelled'
+        if time.monotonic() > job.deadline:
+            return f'Task exceeded the {self.timeout} second time limit'
+        return None
+
+    def _convert_in_thread(self, job, input_path, output_path, report_progress):
+        def checked_report_progress(processed_events, total_events):
+            reason = self._stop_reason(job)
+            if reason:
+                raise TaskCancelled(reason)
+            report_progress(processed_events, total_events)
+
+        checked_report_progress(0, 1)
+        return convert_calendar(input_path, output_path, checked_report_progress)
+
+    # 작업자 프로세스가 죽어 사용할 수 없게 된 프로세스 풀을 새로 만드는 함수
+    def _replace_process_pool(self, broken_pool):
+        with self._process_pool_lock:
+            # 다른 작업이 이미 새로 만들었으면 그대로 사용합니다
+            if self._process_pool is not broken_pool:
+                return
+            logger.warning("Process pool is broken, starting a new one")
+            METRICS.inc('process_pool_restarts_total')
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self._process_worker_count, mp_context=multiprocessing.get_context('fork'),
+            )
+        broken_pool.shutdown(wait=False, cancel_futures=True)
+
+    # 작업을 처리 중인 작업자 프로세스를 강제로 종료하는 함수 (프로세스 풀 전체가 사용할 수 없게 됩니다)
+    def _kill_worker(self, job, pool, reason):
+        pid = self._worker_pids.get(job.task_id)
+        if pid is None:
+            return False
+        logger.warning(f"Killing worker process {pid} of task {job.task_id}: {reason}")
+        METRICS.inc('process_workers_killed_total')
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        self._replace_process_pool(pool)
+        return True
+
+    def _convert_in_process(self, job, input_path, output_path, report_progress):
+        # 다른 작업자가 죽어 풀이 깨진 경우에는 새 풀에서 한 번 더 시도합니다
+        for attempt in range(2):
+            pool = self._process_pool
+            try:
+                return self._wait_for_worker(job, pool, input_path, output_path, report_progress)
+            except BrokenProcessPool:
+                self._replace_process_pool(pool)
+                reason = self._stop_reason(job)
+                if reason:
+                    raise TaskCancelled(reason)
+                if attempt:
+                    raise
+                logger.warning(f"Worker process died while converting task {job.task_id}, retrying")
+
+    def _wait_for_worker(self, job, pool, input_path, output_path, report_progress):
+        # 세대를 먼저 읽어야, 새 데이터가 이전 세대 번호로 작업자에 캐시되는 일이 없습니다
+        generation = LOCATION_CACHE.generation
+        data = CLASSROOM_INDEX.data
+        future = pool.submit(
+            _convert_in_worker, input_path, output_path, job.task_id, generation, data,
+            self._shared_progress, self._cancel_requests, self._worker_pids,
+        )
+        stop_requested_at = None
+        try:
+            while True:
+                try:
+                    return future.result(timeout=PROCESS_POLL_INTERVAL)
+                except FuturesTimeoutError:
+                    pass
+
+                reason = self._stop_reason(job)
+                if reason and future.cancel():
+                    raise TaskCancelled(reason)
+                if reason:
+                    self._cancel_requests[job.task_id] = reason
+                    # 진행 상황 보고 시점에 멈추지 않는 작업자(전체 개수 세기, 멈춘 파싱 등)는 잠시 후 강제로 종료합니다
+                    if stop_requested_at is None:
+                        stop_requested_at = time.monotonic()
+                    elif time.monotonic() - stop_requested_at > PROCESS_KILL_GRACE and self._kill_worker(job, pool, reason):
+                        raise TaskCancelled(reason)
+
+                progress = self._shared_progress.get(job.task_id)
+                if progress:
+                    report_progress(*progress)
+        finally:
+            self._shared_progress.pop(job.task_id, None)
+            self._cancel_requests.pop(job.task_id, None)
+            self._worker_pids.pop(job.task_id, None)
+
+task_scheduler = TaskScheduler(
+    WORKER_COUNT, MAX_TASKS, TASK_TIMEOUT, use_processes=USE_PROCESS_POOL,
+    batch_worker_count=BATCH_WORKER_COUNT, max_batches=MAX_BATCHES,
+)
+
+# 작업 상태를 /status 응답 및 이벤트 스트림과 같은 형식의 dict로 반환하는 함수
+def task_state(task_id):
+    with queue_lock:
+        if task_id in task_results:
+            if task_results[task_id]:
+                return {'state': 'SUCCESS', 'progress': 100}
+            state = {'state': 'FAILURE', 'progress': 0}
+            if task_id in task_errors:
+                state['error'] = task_errors[task_id]
+            return state
+        if task_id not in task_queue:
+            return {'state': 'UNKNOWN', 'progress': 0}
+        progress = task_progress.get(task_id, 0)
+
+    return {'state': 'PENDING', 'progress': progress, 'queue_position': task_scheduler.queue_position(task_id)}
+
+# 로컬에 저장한 교실 찾기 페이지를 응답 객체로 읽는 함수 (CLASSROOM_FINDER_URL이 파일 경로일 때 사용합니다)
+def read_local_classroom_page(path):
+    if path.startswith('file://'):
+        path = url2pathname(urlparse(path).path)
+    response = requests.Response()
+    try:
+        with open(path, 'rb') as f:
+            response._content = f.read()
+    except OSError as e:
+        logger.error(f"Error reading classroom page {path}: {e}")
+        return None
+    response.status_code = 200
+    response.encoding = 'utf-8'
+    response.url = path
+    return response
+
+# 교실 데이터를 가져오는 함수 (etag나 last_modified를 주면 변경되지 않았을 때 304 응답을 받습니다)
+def fetch_classroom_data(etag=None, last_modified=None):
+    if urlparse(CLASSROOM_FINDER_URL).scheme not in ('http', 'https'):
+        return read_local_classroom_page(CLASSROOM_FINDER_URL)
+
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
 
-# 교실 데이터를 가져오는 함수
-def fetch_classroom_data():
-    url = "https://semmelweis.hu/registrar/information/classroom-finder/"
     for attempt in range(MAX_RETRIES):
+        started = time.perf_counter()
         try:
             logger.info(f"Fetching classroom data, attempt {attempt + 1}/{MAX_RETRIES}")
-            response = requests.get(url, timeout=60)
+            response = requests.get(CLASSROOM_FINDER_URL, timeout=60, headers=headers)
+            if response.status_code == 304:
+                logger.info("Classroom data not modified since the last fetch")
+                METRICS.observe('classroom_fetch_seconds', time.perf_counter() - started, result='not_modified')
+                return response
             response.raise_for_status()
             logger.info("Successfully fetched classroom data")
-            return response.text
+            METRICS.observe('classroom_fetch_seconds', time.perf_counter() - started, result='ok')
+            return response
         except requests.RequestException as e:
             logger.error(f"Error fetching data: {e}")
+            METRICS.observe('classroom_fetch_seconds', time.perf_counter() - started, result='failed')
             if attempt < MAX_RETRIES - 1:
                 logger.info(f"Retrying in {RETRY_DELAY} seconds...")
                 time.sleep(RETRY_DELAY)
@@ -131,48 +1084,299 @@ def fetch_classroom_data():
                 logger.error("Maximum retries reached. Failed to fetch data.")
     return None
 
+# 교실 표를 해석할 때 사용하는 정규식과 파싱 범위 (페이지 전체가 아니라 교실 표만 트리로 만듭니다)
+ADDRESS_PATTERN = re.compile(r'\d.*')
+ADDRESS_SUFFIX_PATTERN = re.compile(r'\d.*$')
+COMMA_SUFFIX_PATTERN = re.compile(r',.*$')
+CLASSROOM_TABLE_ID = 'tablepress-16'
+CLASSROOM_TABLE_STRAINER = SoupStrainer(id=CLASSROOM_TABLE_ID)
+CLASSROOM_TABLE_START_PATTERN = re.compile(r'<table\b[^>]*\bid=["\']?' + CLASSROOM_TABLE_ID + r'\b', re.IGNORECASE)
+TABLE_START_PATTERN = re.compile(r'<table\b', re.IGNORECASE)
+TABLE_END_PATTERN = re.compile(r'</table\s*>', re.IGNORECASE)
+
+# 페이지에서 교실 표 부분의 HTML만 잘라 내는 함수 (찾지 못하거나 표 안에 다른 표가 있으면 페이지 전체를 반환합니다)
+def _classroom_table_html(html):
+    start = CLASSROOM_TABLE_START_PATTERN.search(html)
+    if not start:
+        return html
+    end = TABLE_END_PATTERN.search(html, start.end())
+    if not end or TABLE_START_PATTERN.search(html, start.end(), end.start()):
+        return html
+    return html[start.start():end.end()]
+
 # 교실 데이터를 파싱하는 함수
 def parse_classroom_data(html):
-    soup = BeautifulSoup(html, 'html.parser')
-    results = soup.select("#tablepress-16 > tbody > tr")
+    soup = BeautifulSoup(_classroom_table_html(html), 'html.parser', parse_only=CLASSROOM_TABLE_STRAINER)
     data = []
 
-    for result in results:
-        department = result.select_one("td.column-1").get_text(strip=True)
-        address = result.select_one("td.column-2").get_text(strip=True)
-        address_match = re.search(r'\d.*', address)
-        address_cleaned = address_match.group() if address_match else address
-        
-        department_parts = department.split(' - ', 1)
-        classroom_code = department_parts[0]
-        classroom_details = department_parts[1] if len(department_parts) > 1 else ""
-        
-        pure_department = re.sub(r'\d.*$', '', address).strip()
-        pure_department = re.sub(r',.*$', '', pure_department).strip()
-        
-        data.append((classroom_code, classroom_details, pure_department, address_cleaned))
-    
+    for table in soup.find_all(id=CLASSROOM_TABLE_ID):
+        for tbody in table.find_all('tbody', recursive=False):
+            for result in tbody.find_all('tr', recursive=False):
+                department = result.find('td', class_='column-1').get_text(strip=True)
+                address = result.find('td', class_='column-2').get_text(strip=True)
+                address_match = ADDRESS_PATTERN.search(address)
+                address_cleaned = address_match.group() if address_match else address
+
+                department_parts = department.split(' - ', 1)
+                classroom_code = department_parts[0]
+                classroom_details = department_parts[1] if len(department_parts) > 1 else ""
+
+                pure_department = ADDRESS_SUFFIX_PATTERN.sub('', address).strip()
+                pure_department = COMMA_SUFFIX_PATTERN.sub('', pure_department).strip()
+
+                data.append((classroom_code, classroom_details, pure_department, address_cleaned))
+
     return data
 
+# 이전 교실 데이터와 비교하여 행 단위 변경분을 구하는 함수
+# reordered가 True이면 그대로 남은 행들의 순서가 바뀐 것으로, 첫 번째 매칭 결과가 달라질 수 있습니다
+def diff_classroom_data(old_data, new_data):
+    old_counts = Counter(old_data)
+    new_counts = Counter(new_data)
+    kept_counts = old_counts & new_counts
+
+    def kept_rows(data):
+        remaining = Counter(kept_counts)
+        rows = []
+        for row in data:
+            if remaining[row]:
+                remaining[row] -= 1
+                rows.append(row)
+        return rows
+
+    return {
+        'added': list((new_counts - old_counts).elements()),
+        'removed': list((old_counts - new_counts).elements()),
+        'reordered': kept_rows(old_data) != kept_rows(new_data),
+    }
+
+# 교실 데이터 변경분에 따라 결과가 달라질 수 있는 장소 캐시 항목을 판별하는 함수를 만듭니다
+def location_cache_filter(diff):
+    removed = set(diff['removed'])
+    added_codes = [row[0] for row in diff['added']]
+
+    def affected(location, resolved):
+        # 매칭되었던 교실 행이 삭제되었거나 바뀐 경우
+        if resolved[:4] in removed:
+            return True
+        # 부분 검색까지 포함해 확인하는 모든 검색어는 이 접두사를 포함하므로, 새 교실 코드가 이를 포함하면 결과가 바뀔 수 있습니다
+        probe = location[:MIN_SEARCH_LENGTH] if len(location) > MIN_SEARCH_LENGTH else location
+        return any(probe in code for code in added_codes)
+
+    return affected
+
+# 새 교실 인덱스로 교체하고 관련 캐시를 무효화하는 함수 (데이터가 바뀐 경우 True를 반환합니다)
+def apply_classroom_index(new_index):
+    global CLASSROOM_DATA, CLASSROOM_INDEX
+    if new_index.fingerprint == CLASSROOM_INDEX.fingerprint:
+        return False
+    diff = diff_classroom_data(CLASSROOM_INDEX.data, new_index.data)
+    logger.info(
+        f"Classroom data changes: {len(diff['added'])} rows added, {len(diff['removed'])} rows removed"
+        f"{', rows reordered' if diff['reordered'] else ''}"
+    )
+
+    # 인덱스를 먼저 완성한 뒤 한 번에 교체하여, 검색 중에 반쯤 만들어진 인덱스가 보이지 않도록 합니다
+    CLASSROOM_INDEX = new_index
+    CLASSROOM_DATA = new_index.data
+    # 행 순서가 그대로이면 변경분에 영향을 받는 장소 캐시 항목만 지웁니다
+    LOCATION_CACHE.invalidate(None if diff['reordered'] else location_cache_filter(diff))
+    RESULT_CACHE.invalidate(new_index.fingerprint)
+    return True
+
+# 마지막으로 불러오거나 저장한 스냅샷 파일의 수정 시각
+_snapshot_mtime = None
+
+# 교실 데이터를 디스크 스냅샷으로 저장하는 함수 (다른 작업자와 재시작 후에도 사용됩니다)
+def save_classroom_snapshot():
+    global _snapshot_mtime
+    snapshot = dict(classroom_source, fingerprint=CLASSROOM_INDEX.fingerprint, data=CLASSROOM_DATA)
+    temp_path = f"{CLASSROOM_SNAPSHOT_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, CLASSROOM_SNAPSHOT_PATH)
+        _snapshot_mtime = os.stat(CLASSROOM_SNAPSHOT_PATH).st_mtime_ns
+    except OSError as e:
+        logger.error(f"Failed to save classroom data snapshot: {e}")
+
+# 스냅샷 파일이 마지막으로 읽은 뒤 바뀌었으면 다시 불러오는 함수 (불러온 경우 True를 반환합니다)
+def load_classroom_snapshot():
+    global _snapshot_mtime
+    try:
+        mtime = os.stat(CLASSROOM_SNAPSHOT_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return False
+    if mtime == _snapshot_mtime:
+        return False
+
+    try:
+        with open(CLASSROOM_SNAPSHOT_PATH, encoding='utf-8') as f:
+            snapshot = json.load(f)
+        new_index = ClassroomIndex(tuple(row) for row in snapshot['data'])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.error(f"Failed to load classroom data snapshot: {e}")
+        return False
+    # 교실 데이터가 없는 스냅샷은 없는 것으로 취급합니다
+    if not new_index.data:
+        logger.warning("Classroom data snapshot is empty, ignoring it")
+        return False
+
+    _snapshot_mtime = mtime
+    for key in classroom_source:
+        classroom_source[key] = snapshot.get(key, classroom_source[key])
+    if apply_classroom_index(new_index):
+        logger.info(f"Classroom data loaded from snapshot with {len(CLASSROOM_DATA)} records")
+    return True
+
 # 데이터를 초기화하고 업데이트하는 함수
 def initialize_and_update_data():
-    global CLASSROOM_DATA
     logger.info("Starting classroom data initialization and update")
-    html = fetch_classroom_data()
-    if html:
-        CLASSROOM_DATA = parse_classroom_data(html)
-        logger.info(f"Classroom data updated with {len(CLASSROOM_DATA)} records")
-        logger.debug(f"Sample classroom data: {CLASSROOM_DATA[:5]}")
+    # 이미 데이터가 있을 때만 조건부 요청을 보냅니다
+    if CLASSROOM_DATA:
+        response = fetch_classroom_data(classroom_source['etag'], classroom_source['last_modified'])
     else:
+        response = fetch_classroom_data()
+
+    if response is None:
         logger.error("Failed to fetch classroom data after multiple retries.")
+    else:
+        if response.status_code != 304:
+            started = time.perf_counter()
+            data = parse_classroom_data(response.text)
+            METRICS.observe('classroom_parse_seconds', time.perf_counter() - started)
+            # 점검 페이지나 레이아웃 변경으로 표를 찾지 못한 경우, 데이터와 스냅샷, 가져온 시각을 그대로 두어 다음에 다시 시도합니다
+            if not data:
+                logger.error(f"No classroom rows found in the fetched page, keeping the current {len(CLASSROOM_DATA)} records")
+                return
+            if apply_classroom_index(ClassroomIndex(data)):
+                logger.info(f"Classroom data updated with {len(CLASSROOM_DATA)} records")
+                logger.debug(f"Sample classroom data: {CLASSROOM_DATA[:5]}")
+            else:
+                logger.info(f"Classroom data unchanged ({len(CLASSROOM_DATA)} records)")
+            classroom_source['etag'] = response.headers.get('ETag')
+            classroom_source['last_modified'] = response.headers.get('Last-Modified')
+        classroom_source['fetched_at'] = time.time()
+        save_classroom_snapshot()
     logger.info("Classroom data initialization and update completed")
 
+# 이 앱이 임시 디렉터리에 만드는 업로드 파일과 결과 파일의 이름 형식
+TEMP_FILE_PATTERN = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}(_output)?\.ics$')
+
+# 임시 디렉터리에 남아 있는 업로드 파일과 결과 파일의 개수와 크기를 종류별로 반환하는 함수
+def temp_file_usage():
+    usage = {'upload': [0, 0], 'output': [0, 0]}
+    try:
+        entries = list(os.scandir(TEMP_DIR))
+    except OSError:
+        return usage
+    for entry in entries:
+        match = TEMP_FILE_PATTERN.match(entry.name)
+        if not match:
+            continue
+        try:
+            size = entry.stat().st_size
+        except OSError:
+            continue
+        kind = usage['output' if match.group(1) else 'upload']
+        kind[0] += 1
+        kind[1] += size
+    return usage
+
+# 보관 시간이 지난 작업의 결과, 진행 상황, 임시 파일을 정리하는 함수
+def reap_expired_tasks(now=None):
+    now = time.time() if now is None else now
+    expired_before = now - TASK_RESULT_TTL
+
+    with queue_lock:
+        expired = [task_id for task_id, finished_at in task_finished_at.items() if finished_at < expired_before]
+        output_paths = []
+        for task_id in expired:
+            output_paths.append(task_results.pop(task_id, None))
+            task_progress.pop(task_id, None)
+            task_errors.pop(task_id, None)
+            task_timings.pop(task_id, None)
+            del task_finished_at[task_id]
+        # 아직 진행 중이거나 보관 중인 작업의 파일은 지우지 않습니다
+        in_use = set(task_queue.values()) | {path for path in task_results.values() if path}
+
+    removed_files = 0
+    for path in output_paths:
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+                removed_files += 1
+            except OSError as e:
+                logger.warning(f"Failed to remove {path}: {e}")
+
+    # 재시작 등으로 기록이 사라진 작업의 오래된 임시 파일도 정리합니다
+    try:
+        entries = list(os.scandir(TEMP_DIR))
+    except OSError:
+        entries = []
+    for entry in entries:
+        if not TEMP_FILE_PATTERN.match(entry.name) or entry.path in in_use:
+            continue
+        try:
+            if entry.stat().st_mtime < expired_before:
+                os.remove(entry.path)
+                removed_files += 1
+        except OSError:
+            pass
+
+    METRICS.inc('reaper_runs_total')
+    METRICS.inc('reaped_tasks_total', len(expired))
+    METRICS.inc('reaped_files_total', removed_files)
+    if expired or removed_files:
+        logger.info(f"Reaped {len(expired)} expired tasks and {removed_files} temporary files")
+    return len(expired), removed_files
+
+# 주기적으로 만료된 작업을 정리하는 함수
+def reap_periodically(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            reap_expired_tasks()
+        except Exception as e:
+            logger.error(f"Error reaping expired tasks: {e}", exc_info=True)
+
+# 이 프로세스가 잡고 있는 갱신 담당 잠금 파일
+_refresher_lock_file = None
+
+# 여러 작업자 중 하나만 교실 데이터를 갱신하도록 파일 잠금을 시도하는 함수
+def acquire_refresher_lock():
+    global _refresher_lock_file
+    if _refresher_lock_file is not None:
+        return True
+    lock_file = open(f"{CLASSROOM_SNAPSHOT_PATH}.lock", 'a')
+    try:
+        # flock과 달리 lockf 잠금은 fork한 프로세스 풀 작업자에게 물려지지 않아, 이 프로세스가 죽으면 바로 풀립니다
+        fcntl.lockf(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    _refresher_lock_file = lock_file
+    logger.info(f"Process {os.getpid()} is now the classroom data refresher")
+    return True
+
 # 주기적으로 데이터를 업데이트하는 함수
+# 잠금을 얻은 작업자만 사이트에서 데이터를 가져오고, 나머지는 스냅샷이 바뀌면 다시 불러옵니다
 def update_data_periodically(interval):
+    last_attempt = 0
     while True:
-        initialize_and_update_data()
-        logger.info(f"Sleeping for {interval} seconds before the next update.")
-        time.sleep(interval)
+        # 예외로 스레드가 끝나면 갱신 담당 잠금이 풀리지 않아 어떤 작업자도 갱신하지 못하므로, 기록만 하고 계속합니다
+        try:
+            if acquire_refresher_lock():
+                load_classroom_snapshot()
+                # 아직 데이터가 없으면 스냅샷 확인 주기마다 다시 시도합니다
+                if not CLASSROOM_DATA or time.time() - max(classroom_source['fetched_at'], last_attempt) >= interval:
+                    last_attempt = time.time()
+                    initialize_and_update_data()
+            else:
+                load_classroom_snapshot()
+        except Exception as e:
+            logger.error(f"Error updating classroom data: {e}", exc_info=True)
+        time.sleep(SNAPSHOT_CHECK_INTERVAL)
 
 # Flask 애플리케이션을 생성하는 함수
 def create_app():
@@ -180,17 +1384,22 @@ def create_app():
 
     def initialize_data():
         logger.info("Initializing application data...")
-        initialize_and_update_data()
-        
-        # 데이터가 로드될 때까지 대기
-        timeout = 60  # 60초 타임아웃
-        start_time = time.time()
-        while not CLASSROOM_DATA:
-            if time.time() - start_time > timeout:
-                logger.error("Timeout while waiting for classroom data to be loaded.")
-                break
-            logger.info("Waiting for classroom data to be loaded...")
-            time.sleep(5)
+
+        # 디스크 스냅샷이 있으면 바로 사용하고, 갱신은 백그라운드 스레드에 맡깁니다
+        if load_classroom_snapshot():
+            pass
+        elif acquire_refresher_lock():
+            initialize_and_update_data()
+        else:
+            # 다른 작업자가 첫 스냅샷을 만드는 중이면 완성될 때까지 대기
+            timeout = 60  # 60초 타임아웃
+            start_time = time.time()
+            while not load_classroom_snapshot():
+                if time.time() - start_time > timeout:
+                    logger.error("Timeout while waiting for classroom data to be loaded.")
+                    break
+                logger.info("Waiting for classroom data to be loaded...")
+                time.sleep(5)
         
         if CLASSROOM_DATA:
             logger.info(f"Classroom data loaded with {len(CLASSROOM_DATA)} records")
@@ -198,16 +1407,25 @@ def create_app():
             logger.error("Failed to load classroom data")
 
         # 주기적인 업데이트 스레드 시작
-        update_interval = 3600  # 1시간(3600초)
-        update_thread = threading.Thread(target=update_data_periodically, args=(update_interval,), daemon=True)
+        update_thread = threading.Thread(target=update_data_periodically, args=(UPDATE_INTERVAL,), daemon=True)
         update_thread.start()
 
+        # 만료된 작업 결과와 임시 파일 정리 스레드 시작
+        reaper_thread = threading.Thread(target=reap_periodically, args=(REAPER_INTERVAL,), daemon=True)
+        reaper_thread.start()
+
     # 애플리케이션 생성 시 데이터 초기화
     initialize_data()
 
+    # 대기열이 가득 찼을 때의 응답을 만드는 함수
+    def too_many_tasks_response():
+        response = jsonify({'error': 'Server is busy, please try again later'})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(RETRY_AFTER)
+        return response
+
     @app.route('/', methods=['GET', 'POST'])
     def index():
-        global task_queue
         if request.method == 'POST':
             logger.debug("POST request received")
             if 'file' not in request.files:
@@ -221,26 +1439,43 @@ def create_app():
             if file and file.filename.endswith('.ics'):
                 logger.debug(f"Processing file: {file.filename}")
                 try:
-                    temp_file_path = os.path.join('/tmp', f'{uuid.uuid4()}.ics')
-                    file.save(temp_file_path)
-                    logger.debug(f"File saved to temporary path: {temp_file_path}")
+                    temp_file_path = os.path.join(TEMP_DIR, f'{uuid.uuid4()}.ics')
+                    started = time.perf_counter()
+                    content_hash = save_upload(file, temp_file_path)
+                    upload_time = time.perf_counter() - started
+                    METRICS.observe('upload_seconds', upload_time)
+                    METRICS.inc('upload_bytes_total', os.path.getsize(temp_file_path))
+                    logger.debug(f"File saved to temporary path: {temp_file_path} (sha256 {content_hash})")
                     
                     task_id = str(uuid.uuid4())
+                    task_timings[task_id] = {'upload': upload_time}
+
+                    # 같은 교실 데이터로 이미 변환한 파일이면 캐시된 결과로 바로 완료 처리
+                    if RESULT_CACHE.get(content_hash, CLASSROOM_INDEX.fingerprint, task_output_path(task_id)):
+                        os.remove(temp_file_path)
+                        with queue_lock:
+                            task_progress[task_id] = 100
+                        METRICS.inc('conversions_total', mode='task', result='cached')
+                        finish_task(task_id, task_output_path(task_id))
+                        logger.debug(f"Task {task_id} served from result cache")
+                        return jsonify({'task_id': task_id})
+
                     with queue_lock:
                         task_queue[task_id] = temp_file_path
                         task_progress[task_id] = 0
                     
+                    # 작업자 풀의 대기열에 작업을 추가
+                    if not task_scheduler.submit(task_id, temp_file_path, content_hash):
+                        logger.warning("Task queue is full, rejecting upload")
+                        with queue_lock:
+                            del task_queue[task_id]
+                            del task_progress[task_id]
+                        task_timings.pop(task_id, None)
+                        METRICS.inc('tasks_rejected_total')
+                        os.remove(temp_file_path)
+                        return too_many_tasks_response()
+
                     logger.debug(f"Task created: {task_id}")
-                    logger.debug(f"Current task queue: {task_queue}")
-                    
-                    if len(task_queue) > MAX_TASKS:
-                        oldest_task = next(iter(task_queue))
-                        del task_queue[oldest_task]
-                        del task_progress[oldest_task]
-                    
-                    # 새로운 스레드에서 달력 처리를 즉시 시작
-                    threading.Thread(target=process_calendar, args=(temp_file_path, task_id)).start()
-                    
                     return jsonify({'task_id': task_id})
                 except Exception as e:
                     logger.error(f"Error processing file: {e}", exc_info=True)
@@ -248,23 +1483,191 @@ def create_app():
 
         return render_template('index.html')
 
+    # 업로드된 파일의 크기를 반환하는 함수
+    def upload_size(file):
+        file.stream.seek(0, os.SEEK_END)
+        size = file.stream.tell()
+        file.stream.seek(0)
+        return size
+
+    # 작은 달력을 요청 안에서 바로 변환하여 돌려주는 API (작업 생성과 상태 확인 없이 사용)
+    @app.route('/convert', methods=['POST'])
+    def convert():
+        file = request.files.get('file')
+        if not file or file.filename == '':
+            return jsonify({'error': 'No file part'}), 400
+        if not file.filename.endswith('.ics'):
+            return jsonify({'error': 'Only .ics files are supported'}), 400
+        if upload_size(file) > SYNC_CONVERT_MAX_BYTES:
+            return jsonify({'error': f'File is larger than {SYNC_CONVERT_MAX_BYTES} bytes, upload it to / instead'}), 413
+
+        try:
+            timings = {}
+            started = time.perf_counter()
+            output = convert_calendar_bytes(file.stream.read(), timings)
+            record_conversion('sync', time.perf_counter() - started, timings)
+        except Exception as e:
+            logger.warning(f"Error converting {file.filename}: {e}")
+            METRICS.inc('conversions_total', mode='sync', result='failure')
+            return jsonify({'error': 'Error processing file'}), 400
+
+        return Response(output, mimetype='text/calendar', headers={
+            'Content-Disposition': 'attachment; filename=updated_calendar.ics',
+        })
+
+    # 여러 달력을 한 번에 변환하여 zip 파일로 돌려주는 API
+    @app.route('/convert/batch', methods=['POST'])
+    def convert_batch():
+        files = [file for file in request.files.getlist('files') if file.filename]
+        if not files:
+            return jsonify({'error': 'No files'}), 400
+        if len(files) > BATCH_MAX_FILES:
+            return jsonify({'error': f'At most {BATCH_MAX_FILES} files can be converted at once'}), 413
+        if sum(upload_size(file) for file in files) > BATCH_MAX_BYTES:
+            return jsonify({'error': f'Files are larger than {BATCH_MAX_BYTES} bytes in total'}), 413
+
+        names = []
+        contents = []
+        errors = []
+        for file in files:
+            name = os.path.basename(file.filename.replace('\\', '/'))
+            if not name.endswith('.ics'):
+                errors.append(f"{name}: only .ics files are supported")
+            elif upload_size(file) > SYNC_CONVERT_MAX_BYTES:
+                errors.append(f"{name}: file is larger than {SYNC_CONVERT_MAX_BYTES} bytes")
+            else:
+                names.append(name)
+                contents.append(file.stream.read())
+
+        archive = io.BytesIO()
+        used_names = set()
+        started = time.perf_counter()
+        results = task_scheduler.convert_many(contents)
+        if results is None:
+            logger.warning("Too many batch conversions in progress, rejecting batch")
+            return too_many_tasks_response()
+        METRICS.observe('batch_seconds', time.perf_counter() - started)
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for name, result in zip(names, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Error converting {name} in batch: {result}")
+                    METRICS.inc('conversions_total', mode='batch', result='failure')
+                    errors.append(f"{name}: error processing file")
+                    continue
+                result, timings = result
+                # 다른 방식과 비교할 수 있도록 파일마다 따로 기록합니다
+                record_conversion('batch', timings['convert'], timings)
+                # 같은 이름의 파일이 여러 개이면 번호를 붙입니다
+                base, extension = os.path.splitext(name)
+                unique_name = name
+                number = 2
+                while unique_name in used_names:
+                    unique_name = f"{base} ({number}){extension}"
+                    number += 1
+                used_names.add(unique_name)
+                zip_file.writestr(unique_name, result)
+            if errors:
+                zip_file.writestr('errors.txt', '\n'.join(errors) + '\n')
+
+        archive.seek(0)
+        return send_file(archive, mimetype='application/zip', as_attachment=True, download_name='updated_calendars.zip')
+
     @app.route('/status/<task_id>')
     def task_status(task_id):
-        logger.debug(f"Checking status for task {task_id}")
-        if task_id in task_results:
-            if task_results[task_id]:
-                logger.debug(f"Task {task_id} completed successfully")
-                return jsonify({'state': 'SUCCESS', 'progress': 100})
-            else:
-                logger.warning(f"Task {task_id} failed")
-                return jsonify({'state': 'FAILURE', 'progress': 0})
-        elif task_id in task_queue:
-            progress = task_progress.get(task_id, 0)
-            logger.debug(f"Task {task_id} is pending. Progress: {progress}%")
-            return jsonify({'state': 'PENDING', 'progress': progress})
-        else:
+        state = task_state(task_id)
+        # ?timings=1 이면 단계별 소요 시간(초)을 함께 반환합니다
+        if request.args.get('timings') and task_id in task_timings:
+            state['timings'] = dict(task_timings[task_id])
+        if state['state'] == 'FAILURE':
+            logger.warning(f"Task {task_id} failed")
+        elif state['state'] == 'UNKNOWN':
             logger.warning(f"Unknown task {task_id}")
-            return jsonify({'state': 'UNKNOWN', 'progress': 0})
+        return jsonify(state)
+
+    # 작업 진행 상황을 Server-Sent Events로 보내는 스트림 (/status 반복 조회를 대신합니다)
+    @app.route('/events/<task_id>')
+    def task_events(task_id):
+        # 스트림 수가 한도에 이르면 거절하고, 브라우저는 /status 조회 방식으로 전환합니다
+        if not sse_slots.acquire(blocking=False):
+            METRICS.inc('sse_rejected_total')
+            response = jsonify({'error': 'Too many open event streams, poll /status instead'})
+            response.status_code = 503
+            return response
+
+        def stream():
+            yield 'retry: 1000\n\n'
+            deadline = time.monotonic() + SSE_MAX_DURATION
+            last_state = None
+            last_write = time.monotonic()
+            while True:
+                # 상태를 읽기 전에 version을 기록해 두어, 그 사이의 변경도 놓치지 않습니다
+                version = task_updates.version
+                state = task_state(task_id)
+                if state != last_state:
+                    yield f"data: {json.dumps(state)}\n\n"
+                    last_state = state
+                    last_write = time.monotonic()
+                    if state['state'] != 'PENDING':
+                        return
+                elif time.monotonic() - last_write >= SSE_KEEPALIVE_INTERVAL:
+                    # 다른 작업의 변경으로 깨어난 경우에는 보내지 않고, 일정 시간 조용했을 때만 연결 유지 주석을 보냅니다
+                    yield ': keepalive\n\n'
+                    last_write = time.monotonic()
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                task_updates.wait(version, min(SSE_KEEPALIVE_INTERVAL, remaining))
+
+        response = Response(stream(), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        })
+        # 스트림이 끝나거나 연결이 끊겨 응답이 닫힐 때 자리를 돌려줍니다
+        response.call_on_close(sse_slots.release)
+        return response
+
+    @app.route('/cancel/<task_id>', methods=['POST'])
+    def cancel_task(task_id):
+        logger.debug(f"Cancel requested for task {task_id}")
+        if task_scheduler.cancel(task_id):
+            return jsonify({'cancelled': True})
+        return jsonify({'cancelled': False, 'error': 'Task is not running or queued'})
+
+    @app.route('/stats')
+    def stats():
+        return jsonify({'location_cache': LOCATION_CACHE.stats(), 'result_cache': RESULT_CACHE.stats()})
+
+    # Prometheus 형식의 성능 지표
+    @app.route('/metrics')
+    def metrics():
+        location_cache_stats = LOCATION_CACHE.stats()
+        result_cache_stats = RESULT_CACHE.stats()
+        counters = {}
+        for name, cache_stats in (('location_cache', location_cache_stats), ('result_cache', result_cache_stats)):
+            for key in ('hits', 'misses', 'evictions', 'invalidations'):
+                if key in cache_stats:
+                    counters[(f'{name}_{key}_total', ())] = cache_stats[key]
+
+        pending, running = task_scheduler.counts()
+        with queue_lock:
+            results = len(task_results)
+            progress_entries = len(task_progress)
+        gauges = {
+            ('tasks_pending', ()): pending,
+            ('tasks_running', ()): running,
+            ('task_results', ()): results,
+            ('task_progress_entries', ()): progress_entries,
+            ('classroom_records', ()): len(CLASSROOM_DATA),
+            ('location_cache_entries', ()): location_cache_stats['size'],
+            ('result_cache_entries', ()): result_cache_stats['entries'],
+            ('result_cache_bytes', ()): result_cache_stats['bytes'],
+        }
+        for kind, (count, size) in temp_file_usage().items():
+            gauges[('temp_files', (('kind', kind),))] = count
+            gauges[('temp_bytes', (('kind', kind),))] = size
+
+        return Response(METRICS.render(counters, gauges), mimetype='text/plain; version=0.0.4')
 
     @app.route('/download/<task_id>')
     def download_file(task_id):
@@ -272,7 +1675,13 @@ def create_app():
         if task_id in task_results and task_results[task_id]:
             output_file_path = task_results[task_id]
             logger.debug(f"Sending file for task {task_id}")
-            return send_file(output_file_path, as_attachment=True, download_name='updated_calendar.ics')
+            started = time.perf_counter()
+            response = send_file(output_file_path, as_attachment=True, download_name='updated_calendar.ics')
+            # 파일 본문은 서버가 직접 전송하므로, 응답을 준비하는 데 걸린 시간과 파일 크기만 기록합니다
+            METRICS.observe('download_seconds', time.perf_counter() - started)
+            METRICS.inc('downloads_total')
+            METRICS.inc('download_bytes_total', os.path.getsize(output_file_path))
+            return response
         logger.warning(f"File not ready or task failed for task {task_id}")
         return jsonify({'error': 'File not ready or task failed'})
 
@@ -0,0 +1,274 @@
+# 성능 측정 스크립트: python benchmark.py [저장한 교실 찾기 페이지.html] [--no-sleep]
+# 실제 사이트에 접속하지 않도록, 저장한 페이지나 실제 페이지와 같은 구조의 가짜 교실 표를 사용합니다.
+import os
+import re
+import argparse
+import random
+import string
+import logging
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+logging.disable(logging.CRITICAL)
+
+ROOM_COUNT = 700
+EVENT_COUNTS = [100, 1000, 10000]
+RANDOM_SEED = 42
+
+
+# 실제 교실 찾기 페이지와 같은 구조의 HTML을 만드는 함수
+def make_classroom_html(room_count=ROOM_COUNT, seed=RANDOM_SEED):
+    rng = random.Random(seed)
+    buildings = ['EOK', 'NET', 'TÉT', 'KSK', 'BOK', 'ÁOK', 'NIH', 'SZOK']
+    rows = []
+    for number in range(room_count):
+        building = rng.choice(buildings)
+        code = f"{building}-{rng.choice(['ELM', 'GYAK', 'SZEM', 'LAB'])}-{number}"
+        details = f"Room {number} ({rng.randint(10, 300)} seats)"
+        department = f"Department of {''.join(rng.choices(string.ascii_letters, k=10))}"
+        address = f"{department}, 1094 Budapest, Tűzoltó utca {rng.randint(1, 99)}."
+        rows.append(
+            f'<tr class="row-{number + 2}"><td class="column-1">{code} - {details}</td>'
+            f'<td class="column-2">{address}</td></tr>'
+        )
+    # 실제 페이지처럼 표 바깥에도 메뉴와 본문 등 많은 마크업이 있습니다
+    menu = ''.join(f'<li class="menu-item"><a href="/page-{number}/">Page {number}</a></li>' for number in range(400))
+    text = ''.join(f'<p>Paragraph {number} with <a href="#">a link</a> and <strong>text</strong>.</p>' for number in range(400))
+    return (
+        f'<html><head><script>var x = 1;</script></head><body><nav><ul>{menu}</ul></nav><main>{text}'
+        '<table id="tablepress-16" class="tablepress"><thead><tr><th>Room</th><th>Address</th></tr></thead>'
+        f'<tbody>{"".join(rows)}</tbody></table></main><footer>{text}</footer></body></html>'
+    )
+
+
+# 네트워크 요청 대신 임시 파일로 저장한 HTML을 교실 찾기 페이지로 사용하여 app 모듈을 불러오는 함수
+# (이전 실행의 스냅샷이나 결과 캐시를 쓰지 않도록 임시 디렉터리를 사용합니다)
+def load_app(html):
+    directory = tempfile.mkdtemp()
+    page_path = os.path.join(directory, 'classroom_finder.html')
+    with open(page_path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    os.environ['CLASSROOM_FINDER_URL'] = page_path
+    os.environ['CLASSROOM_SNAPSHOT_PATH'] = os.path.join(directory, 'classroom_snapshot.json')
+    os.environ['RESULT_CACHE_DIR'] = os.path.join(directory, 'result_cache')
+    import app
+    return app
+
+
+# 인덱스 도입 이전의 선형/재귀 검색 (비교용)
+def legacy_fetch_classroom_info(data, classroom_name, partial_search=False):
+    for classroom in data:
+        if classroom_name in classroom[0]:
+            return classroom
+    if partial_search and len(classroom_name) > 5:
+        return legacy_fetch_classroom_info(data, classroom_name[:-1], partial_search=True)
+    return None, None, None, None
+
+
+# 표 전용 파서 도입 이전의 파싱 함수 (비교용)
+def legacy_parse_classroom_data(html):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    data = []
+    for result in soup.select("#tablepress-16 > tbody > tr"):
+        department = result.select_one("td.column-1").get_text(strip=True)
+        address = result.select_one("td.column-2").get_text(strip=True)
+        address_match = re.search(r'\d.*', address)
+        address_cleaned = address_match.group() if address_match else address
+        department_parts = department.split(' - ', 1)
+        classroom_code = department_parts[0]
+        classroom_details = department_parts[1] if len(department_parts) > 1 else ""
+        pure_department = re.sub(r'\d.*$', '', address).strip()
+        pure_department = re.sub(r',.*$', '', pure_department).strip()
+        data.append((classroom_code, classroom_details, pure_department, address_cleaned))
+    return data
+
+
+# 스트리밍 변환 도입 이전의 변환 함수 (비교용, 이벤트 10개마다 0.1초씩 쉬는 것까지 그대로 재현합니다)
+def legacy_convert_calendar(data, input_path, output_path, sleep=True):
+    from icalendar import Calendar
+    logger = logging.getLogger('legacy')
+    with open(input_path, 'rb') as f:
+        cal = Calendar.from_ical(f.read())
+
+    new_cal = Calendar()
+    events = [component for component in cal.walk() if component.name == "VEVENT"]
+    total_events = len(events)
+    processed_events = 0
+
+    for component in events:
+        location = component.get('LOCATION')
+        if location:
+            logger.debug(f"Processing event with location: {location}")
+            classroom_code, classroom_details, pure_department, address_cleaned = legacy_fetch_classroom_info(data, location)
+            if not address_cleaned:
+                classroom_code, classroom_details, pure_department, address_cleaned = legacy_fetch_classroom_info(data, location, True)
+                if address_cleaned:
+                    location_display = f"*({location}){classroom_code}"
+                else:
+                    location_display = location
+            else:
+                location_display = classroom_code
+
+            if address_cleaned:
+                component['LOCATION'] = address_cleaned
+                component['DESCRIPTION'] = f"{location_display} - {classroom_details}\nDepartment: {pure_department}"
+        new_cal.add_component(component)
+
+        processed_events += 1
+        progress = int((processed_events / total_events) * 100)
+        logger.debug(f"Processed {processed_events}/{total_events} events. Progress: {progress}%")
+        if sleep and processed_events % 10 == 0:
+            time.sleep(0.1)
+
+    with open(output_path, 'wb') as f:
+        f.write(new_cal.to_ical())
+
+
+# 달력 이벤트의 LOCATION 값을 흉내 낸 검색어 목록을 만드는 함수
+def make_locations(data, count, seed=RANDOM_SEED):
+    rng = random.Random(seed)
+    locations = []
+    for _ in range(count):
+        kind = rng.random()
+        code = rng.choice(data)[0]
+        if kind < 0.6:
+            locations.append(code)
+        elif kind < 0.9:
+            locations.append(f"{code} (Semmelweis Egyetem, Budapest)")
+        else:
+            locations.append(f"Online {rng.randint(0, 10 ** 6)}")
+    return locations
+
+
+# 기존 process_calendar와 같은 2단계(정확 검색 후 부분 검색) 방식으로 검색하는 함수
+def resolve_all(lookup, locations):
+    for location in locations:
+        classroom = lookup(location)
+        if not classroom[3]:
+            lookup(location, True)
+
+
+# LOCATION 값이 들어 있는 ICS 달력 파일 내용을 만드는 함수
+def make_calendar(data, count, seed=RANDOM_SEED):
+    lines = ['BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:-//Neptun//Calendar//EN']
+    for number, location in enumerate(make_locations(data, count, seed)):
+        lines += [
+            'BEGIN:VEVENT',
+            f'UID:{number}@neptun.semmelweis.hu',
+            'DTSTART:20240902T080000Z',
+            'DTEND:20240902T093000Z',
+            f'SUMMARY:Lecture {number} of a course with a rather long title that has to be folded',
+            f'LOCATION:{location}',
+            f'DESCRIPTION:Original description {number}',
+            'END:VEVENT',
+        ]
+    lines.append('END:VCALENDAR')
+    return ('\r\n'.join(lines) + '\r\n').encode()
+
+
+def bench_parse(app, html):
+    print(f"Classroom page parsing ({len(html) / 1024:,.0f} KiB page)")
+    assert app.parse_classroom_data(html) == legacy_parse_classroom_data(html)
+    for name, parse in (('full tree', legacy_parse_classroom_data), ('table only', app.parse_classroom_data)):
+        elapsed = timeit.timeit(lambda: parse(html), number=3) / 3
+        tracemalloc.start()
+        parse(html)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  {name:>10}: {elapsed * 1000:7.1f} ms, peak {peak / 1024:,.0f} KiB")
+
+
+def bench_lookup(app):
+    data = app.CLASSROOM_DATA
+    index = app.CLASSROOM_INDEX
+    print(f"Classroom lookup ({len(data)} rooms)")
+
+    build_time = timeit.timeit(lambda: app.ClassroomIndex(data), number=5) / 5
+    print(f"  index build: {build_time * 1000:.1f} ms")
+
+    for count in EVENT_COUNTS:
+        locations = make_locations(data, count)
+        for location in locations:
+            assert index.lookup(location, True) == legacy_fetch_classroom_info(data, location, True)
+
+        legacy_time = timeit.timeit(
+            lambda: resolve_all(lambda name, partial=False: legacy_fetch_classroom_info(data, name, partial), locations),
+            number=1,
+        )
+        index_time = timeit.timeit(lambda: resolve_all(index.lookup, locations), number=1)
+        print(
+            f"  {count:>6} events: linear {legacy_time * 1000:9.1f} ms, "
+            f"index {index_time * 1000:7.1f} ms ({legacy_time / index_time:.0f}x)"
+        )
+
+
+def bench_conversion(app, sleep=True):
+    print(f"Calendar conversion (legacy loop {'with' if sleep else 'without'} its sleeps vs convert_calendar)")
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_output_path = os.path.join(directory, 'legacy_output.ics')
+        output_path = os.path.join(directory, 'output.ics')
+        for count in EVENT_COUNTS:
+            input_path = os.path.join(directory, f'{count}.ics')
+            with open(input_path, 'wb') as f:
+                f.write(make_calendar(app.CLASSROOM_DATA, count))
+
+            started = time.perf_counter()
+            legacy_convert_calendar(app.CLASSROOM_DATA, input_path, legacy_output_path, sleep)
+            legacy_time = time.perf_counter() - started
+
+            app.LOCATION_CACHE.invalidate()
+            started = time.perf_counter()
+            app.convert_calendar(input_path, output_path, lambda processed, total: None)
+            elapsed = time.perf_counter() - started
+
+            with open(legacy_output_path, 'rb') as legacy_file, open(output_path, 'rb') as output_file:
+                assert legacy_file.read() == output_file.read()
+            print(
+                f"  {count:>6} events: legacy {legacy_time * 1000:9.1f} ms, "
+                f"new {elapsed * 1000:7.1f} ms ({count / elapsed:,.0f} events/s, {legacy_time / elapsed:.1f}x)"
+            )
+
+
+def bench_memory(app):
+    print("Peak memory of calendar conversion (tracemalloc)")
+    with tempfile.TemporaryDirectory() as directory:
+        output_path = os.path.join(directory, 'output.ics')
+        for count in EVENT_COUNTS:
+            input_path = os.path.join(directory, f'{count}.ics')
+            with open(input_path, 'wb') as f:
+                f.write(make_calendar(app.CLASSROOM_DATA, count))
+
+            peaks = {}
+            for mode, streaming in (('in-memory', False), ('streaming', True)):
+                app.STREAMING_CONVERSION = streaming
+                tracemalloc.start()
+                app.convert_calendar(input_path, output_path, lambda processed, total: None)
+                peaks[mode] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            app.STREAMING_CONVERSION = True
+
+            size = os.path.getsize(input_path)
+            print(
+                f"  {count:>6} events ({size / 1024:,.0f} KiB): in-memory {peaks['in-memory'] / 1024:,.0f} KiB, "
+                f"streaming {peaks['streaming'] / 1024:,.0f} KiB"
+            )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark classroom parsing, lookup and calendar conversion.')
+    parser.add_argument('page', nargs='?', help='saved classroom finder page (synthetic data if omitted)')
+    parser.add_argument('--no-sleep', action='store_true', help='skip the legacy conversion loop\'s sleeps')
+    args = parser.parse_args()
+    if args.page:
+        with open(args.page, encoding='utf-8') as f:
+            page = f.read()
+    else:
+        page = make_classroom_html()
+    app = load_app(page)
+    bench_parse(app, page)
+    bench_lookup(app)
+    bench_conversion(app, sleep=not args.no_sleep)
+    bench_memory(app)
@@ -119,37 +119,56 @@ document.addEventListener('DOMContentLoaded', function() {
         fetch('/', {
             method: 'POST',
             body: formData
-        }).then(response => response.json())
+        }).then(response => {
+            if (response.status === 429) {
+                throw new Error('busy');
+            }
+            return response.json();
+        })
         .then(data => {
             if (data.task_id) {
-                checkStatus(data.task_id);
+                watchTask(data.task_id);
             } else {
                 throw new Error('No task ID received');
             }
         }).catch(error => {
+            if (error.message === 'busy') {
+                alert('The server is busy right now. Please try again in a moment.');
+                resetForm();
+                return;
+            }
             console.error('Error:', error);
             alert('An error occurred during file upload.');
             resetForm();
         });
     });
 
+    // 서버가 보내는 진행 상황 이벤트를 구독하고, 지원되지 않으면 /status 조회로 대신합니다
+    function watchTask(taskId) {
+        if (!window.EventSource) {
+            checkStatus(taskId);
+            return;
+        }
+
+        const events = new EventSource(`/events/${taskId}`);
+        events.onmessage = function(event) {
+            if (!handleStatus(taskId, JSON.parse(event.data))) {
+                events.close();
+            }
+        };
+        events.onerror = function() {
+            // 연결이 완전히 닫힌 경우에만 조회 방식으로 전환합니다 (그 외에는 브라우저가 다시 연결합니다)
+            if (events.readyState === EventSource.CLOSED) {
+                checkStatus(taskId);
+            }
+        };
+    }
+
     function checkStatus(taskId) {
         fetch(`/status/${taskId}`)
         .then(response => response.json())
         .then(data => {
-            if (data.state === 'SUCCESS') {
-                targetProgress = 100;
-                updateProgressBar();
-                progressText.textContent = 'Processing complete. Downloading...';
-                window.location.href = `/download/${taskId}`;
-                setTimeout(resetForm, 3000);
-            } else if (data.state === 'FAILURE') {
-                alert('An error occurred during the conversion process.');
-                resetForm();
-            } else {
-                targetProgress = data.progress;
-                updateProgressBar();
-                progressText.textContent = `Processing... ${Math.round(currentProgress)}% complete. This may take several minutes.`;
+            if (handleStatus(taskId, data)) {
                 setTimeout(() => checkStatus(taskId), 1000);
             }
         }).catch(error => {
@@ -159,6 +178,31 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
+    // 작업 상태를 화면에 반영하고, 작업이 아직 진행 중이면 true를 반환합니다
+    function handleStatus(taskId, data) {
+        if (data.state === 'SUCCESS') {
+            targetProgress = 100;
+            updateProgressBar();
+            progressText.textContent = 'Processing complete. Downloading...';
+            window.location.href = `/download/${taskId}`;
+            setTimeout(resetForm, 3000);
+            return false;
+        } else if (data.state === 'FAILURE' || data.state === 'UNKNOWN') {
+            alert('An error occurred during the conversion process.');
+            resetForm();
+            return false;
+        }
+
+        targetProgress = data.progress;
+        updateProgressBar();
+        if (data.queue_position > 0) {
+            progressText.textContent = `Waiting in queue (position ${data.queue_position})...`;
+        } else {
+            progressText.textContent = `Processing... ${Math.round(currentProgress)}% complete. This may take several minutes.`;
+        }
+        return true;
+    }
+
     function updateProgressBar() {
         if (currentProgress < targetProgress) {
             currentProgress += (targetProgress - currentProgress) * 0.1;